@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Silent by default; set LOGLEVEL=INFO (or DEBUG for per-call token usage) to see progress
+logging.basicConfig(level=os.getenv("LOGLEVEL", "WARNING").upper(), format="%(message)s")
+log = logging.getLogger("diagmind.demo")
+
+# Allow running this script directly without installing the package
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.append(str(SRC_ROOT))
+
+from diagmind.pipeline import run_pipeline_async, save_run  # noqa: E402
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Cap on LLM requests in flight at once, shared by every topic's pipeline
+MAX_CONCURRENT_REQUESTS = 4
+
+# Independent demo topics; each one runs its own pipeline
+ALL_INPUTS = [
+    {
+        "Scientific topic": "Photosynthesis",
+        "Audience": "High School",
+        "Purpose": "Explain how plants convert light into chemical energy",
+        "Desired detail level": "medium",
+    },
+    {
+        "Scientific topic": "Solar System",
+        "Audience": "Middle School",
+        "Purpose": "Show the planets and how they orbit the Sun",
+        "Desired detail level": "low",
+    },
+    {
+        "Scientific topic": "Life Cycle of Butterfly",
+        "Audience": "Middle School",
+        "Purpose": "Show the life cycle of a butterfly",
+        "Desired detail level": "medium",
+    },
+]
+
+
+async def run_and_save(
+    inputs: dict, runs_dir: Path, run_id: str, semaphore: asyncio.Semaphore
+) -> None:
+    graph = await run_pipeline_async(inputs, semaphore=semaphore)
+    # Render in a worker thread: the graphviz subprocess for this topic
+    # overlaps with the LLM calls still in flight for the other topics
+    slug = inputs["Scientific topic"].lower().replace(" ", "_")
+    await asyncio.to_thread(save_run, graph, inputs, runs_dir / f"run-{run_id}-{slug}")
+
+
+async def main() -> None:
+    # Persist artifacts (JSON + PNG) into runs/, one pair per topic; created
+    # up front so a bad filesystem fails before any LLM spend
+    runs_dir = PROJECT_ROOT / "runs"
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    # The topics don't depend on each other, so their LLM round trips overlap.
+    # A failing topic must not cancel the others mid-flight and waste their
+    # already-paid LLM calls, so errors are collected rather than raised.
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    results = await asyncio.gather(
+        *[run_and_save(inputs, runs_dir, run_id, semaphore) for inputs in ALL_INPUTS],
+        return_exceptions=True,
+    )
+
+    failed = 0
+    for inputs, result in zip(ALL_INPUTS, results):
+        topic = inputs["Scientific topic"]
+        if isinstance(result, BaseException):
+            failed += 1
+            log.error("%s: failed", topic, exc_info=result)
+        else:
+            log.info("%s: saved", topic)
+    if failed:
+        sys.exit(f"{failed} of {len(ALL_INPUTS)} topics failed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
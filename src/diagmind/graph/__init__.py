@@ -9,7 +9,7 @@ from .types import (
 from .node import Node, NodeAttributes
 from .edges import Edge, EdgeAttributes
 from .constraint import Constraint
-from .graph import DiagramGraph, DiagramMetadata
+from .graph import DiagramGraph, DiagramMetadata, GraphvizNotFoundError
 
 __all__ = [
     # Types
@@ -27,5 +27,7 @@ __all__ = [
     "Constraint",
     "DiagramGraph",
     "DiagramMetadata",
+    # Errors
+    "GraphvizNotFoundError",
 ]
 
@@ -1,9 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Literal, Dict, Any, List
+from typing import Optional, Dict, List
 from .types import ConstraintFamily
 
 class Constraint(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
     
     id: str
 
@@ -27,3 +27,8 @@ class Constraint(BaseModel):
         default=None,
         description="Constraint-specific parameters"
     )
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Constraint":
+        """Build from already-validated data (e.g. model_dump() output) without re-validating."""
+        return cls.model_construct(**data)
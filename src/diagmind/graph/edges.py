@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Literal, Dict, Any, List
-from .types import EdgeFamily
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, Literal
+from .types import EdgeFamily, intern_vocab
 
 class EdgeAttributes(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
+
     directional: bool = True
 
     temporal: Optional[Literal["before", "during", "after", "continuous"]] = None
@@ -19,6 +21,8 @@ class EdgeAttributes(BaseModel):
 
 
 class Edge(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
+
     source: str
     target: str
 
@@ -29,3 +33,18 @@ class Edge(BaseModel):
     )
 
     attributes: EdgeAttributes
+
+    # Literal fields already reuse the Literal's own string objects; operator
+    # is free-form, so equal operators are interned to share one object
+    @field_validator("operator")
+    @classmethod
+    def _intern_operator(cls, value: str) -> str:
+        return intern_vocab(value)
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Edge":
+        """Build from already-validated data (e.g. model_dump() output) without re-validating."""
+        data = dict(data)
+        data["operator"] = intern_vocab(data["operator"])
+        data["attributes"] = EdgeAttributes.model_construct(**data["attributes"])
+        return cls.model_construct(**data)
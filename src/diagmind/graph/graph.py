@@ -1,33 +1,127 @@
 from __future__ import annotations
 
+import re
+import shutil
+import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from .node import Node
 from .edges import Edge
 from .constraint import Constraint
 
 
+# Graphviz fill color per node type
+_TYPE_COLORS = {
+    "entity": "lightblue",
+    "process": "lightgreen",
+    "state": "khaki",
+    "variable": "plum",
+    "region": "lightgray",
+    "annotation": "white",
+}
+
+
+class GraphvizNotFoundError(ImportError):
+    """Graphviz's `dot` executable is not available for rendering."""
+
+
+# graphviz.Digraph, resolved on first use since graphviz is optional
+_Digraph = None
+
+
+def _get_digraph():
+    global _Digraph
+    if _Digraph is None:
+        try:
+            from graphviz import Digraph
+        except ImportError as exc:
+            raise ImportError(
+                "graphviz is required for visualization. Install with `pip install graphviz`."
+            ) from exc
+        _Digraph = Digraph
+    return _Digraph
+
+
+_DOT_ID = re.compile(r"([a-zA-Z_][a-zA-Z0-9_]*|-?(\.[0-9]+|[0-9]+(\.[0-9]*)?))$")
+_DOT_KEYWORDS = frozenset({"node", "edge", "graph", "digraph", "subgraph", "strict"})
+_UNESCAPED_QUOTE = re.compile(r'(?<!\\)"')
+
+
+def _dot_quote(value: str) -> str:
+    """Quote a DOT ID/label like graphviz.quote: bare identifiers and numerals stay unquoted."""
+    if _DOT_ID.match(value) and value.lower() not in _DOT_KEYWORDS:
+        return value
+    return '"' + _UNESCAPED_QUOTE.sub(r'\\"', value) + '"'
+
+
+class _OperatorLabels(dict):
+    """Operator -> readable edge label ("flows_to" -> "flows to"), computed once per operator."""
+
+    def __missing__(self, operator: str) -> str:
+        label = self[operator] = operator.replace("_", " ")
+        return label
+
+
+_OPERATOR_LABELS = _OperatorLabels()
+
+# EdgeAttributes.polarity -> suffix used by pretty_connections
+_POLARITY_FRAGMENTS = {
+    None: "",
+    "positive": ", polarity=positive",
+    "negative": ", polarity=negative",
+    "neutral": ", polarity=neutral",
+}
+
+
+def _shallow_dump(model: BaseModel) -> dict:
+    """
+    Fast stand-in for model_dump() on the graph's flat, already-validated
+    models: copies the field dict, expands a nested `attributes` model and
+    copies list/dict fields (e.g. Constraint.scope, whose items are strings)
+    so the result never shares containers with the model.
+    """
+    data = model.__dict__.copy()
+    for key, value in data.items():
+        if isinstance(value, BaseModel):
+            data[key] = value.__dict__.copy()
+        elif isinstance(value, (list, dict)):
+            data[key] = value.copy()
+    return data
+
+
 class DiagramMetadata(BaseModel):
     """High-level description of what the diagram is about and for whom."""
 
-    topic: str = Field(..., description="Scientific topic of the diagram")
-    audience: str = Field(..., description="Intended audience (e.g., Middle School)")
-    purpose: str = Field(..., description="Purpose or learning goal of the diagram")
-    detail_level: str = Field(..., description="Desired detail level (e.g., low/medium/high)")
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
+
+    # Never sent to the LLM as a schema, so the fields are documented here
+    # rather than via Field(description=...)
+    topic: str  # Scientific topic of the diagram
+    audience: str  # Intended audience (e.g., Middle School)
+    purpose: str  # Purpose or learning goal of the diagram
+    detail_level: str  # Desired detail level (e.g., low/medium/high)
 
-    # Parsed diagram intent from the first LLM call
-    intent: Optional[dict] = Field(
-        default=None,
-        description="Structured diagram intent as returned by the LLM",
-    )
+    # Structured diagram intent as returned by the first LLM call
+    intent: Optional[dict] = None
+
+
+class _GraphPayload(BaseModel):
+    """Serialization shape of `DiagramGraph.to_json` (mirrors `to_dict`)."""
+
+    metadata: DiagramMetadata
+    nodes: List[Node]
+    edges: List[Edge]
+    constraints: List[Constraint]
 
 
 class DiagramGraph(BaseModel):
     """In-memory representation of a diagram graph being built incrementally."""
 
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
+
     metadata: DiagramMetadata
 
     # Store nodes by id for easy lookup and de-duplication
@@ -37,18 +131,129 @@ class DiagramGraph(BaseModel):
     edges: List[Edge] = Field(default_factory=list)
     constraints: List[Constraint] = Field(default_factory=list)
 
+    # nodes/edges/constraints should be changed through add_*; direct edits
+    # are noticed by comparing against these copies, and the lookup caches
+    # below are rebuilt before the next cached render
+    _seen_nodes: Dict[str, Node] = PrivateAttr(default_factory=dict)
+    _seen_edges: List[Edge] = PrivateAttr(default_factory=list)
+    _seen_constraints: List[Constraint] = PrivateAttr(default_factory=list)
+
+    # Bumped by every add_* mutator; renderings are cached against it
+    _version: int = PrivateAttr(default=0)
+    _render_cache: Dict[str, Tuple[int, Any]] = PrivateAttr(default_factory=dict)
+
+    # Dense position per node id, and the display label ("Label [id]") at
+    # each position, maintained as nodes are added
+    _node_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _node_labels: List[str] = PrivateAttr(default_factory=list)
+
+    # Column-wise (structure-of-arrays) copy of the edge fields the renderers
+    # read, kept in step with `edges` by add_edges
+    _edge_source: List[str] = PrivateAttr(default_factory=list)
+    _edge_target: List[str] = PrivateAttr(default_factory=list)
+    _edge_family: List[str] = PrivateAttr(default_factory=list)
+    _edge_operator: List[str] = PrivateAttr(default_factory=list)
+    _edge_directional: List[bool] = PrivateAttr(default_factory=list)
+    _edge_polarity: List[Optional[str]] = PrivateAttr(default_factory=list)
+    # Endpoint positions into _node_labels; -1 while the node isn't in the graph
+    _edge_source_pos: List[int] = PrivateAttr(default_factory=list)
+    _edge_target_pos: List[int] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Seed the lookup caches from nodes and edges passed to the constructor."""
+        self._index_nodes(self.nodes.values())
+        self._index_edges(self.edges)
+        self._seen_nodes = dict(self.nodes)
+        self._seen_edges = list(self.edges)
+        self._seen_constraints = list(self.constraints)
+
+    def _resync(self) -> None:
+        """Rebuild the lookup caches if the public containers were edited directly."""
+        # Equality short-circuits on identity, so an untouched graph costs one
+        # C-level pass per container
+        if (
+            self.edges == self._seen_edges
+            and self.nodes == self._seen_nodes
+            and self.constraints == self._seen_constraints
+        ):
+            return
+        self._node_index = {}
+        self._node_labels = []
+        self._edge_source = []
+        self._edge_target = []
+        self._edge_family = []
+        self._edge_operator = []
+        self._edge_directional = []
+        self._edge_polarity = []
+        self._edge_source_pos = []
+        self._edge_target_pos = []
+        self.model_post_init(None)
+        self._version += 1
+
+    def _index_nodes(self, nodes: Iterable[Node]) -> None:
+        index = self._node_index
+        labels = self._node_labels
+        added = False
+        for node in nodes:
+            label = f"{node.label} [{node.id}]"
+            pos = index.get(node.id)
+            if pos is None:
+                index[node.id] = len(labels)
+                labels.append(label)
+                added = True
+            else:
+                labels[pos] = label
+        # Edges may have been added before the nodes they point at
+        if added and (-1 in self._edge_source_pos or -1 in self._edge_target_pos):
+            self._edge_source_pos = [index.get(n, -1) for n in self._edge_source]
+            self._edge_target_pos = [index.get(n, -1) for n in self._edge_target]
+
+    def _index_edges(self, edges: List[Edge]) -> None:
+        # Build each new column locally, then extend once per column
+        index = self._node_index
+        sources = [edge.source for edge in edges]
+        targets = [edge.target for edge in edges]
+        attrs = [edge.attributes for edge in edges]
+        self._edge_source.extend(sources)
+        self._edge_target.extend(targets)
+        self._edge_family.extend([edge.family for edge in edges])
+        self._edge_operator.extend([edge.operator for edge in edges])
+        self._edge_directional.extend([a.directional for a in attrs])
+        self._edge_polarity.extend([a.polarity for a in attrs])
+        self._edge_source_pos.extend([index.get(n, -1) for n in sources])
+        self._edge_target_pos.extend([index.get(n, -1) for n in targets])
+
     def add_nodes(self, nodes: List[Node]) -> None:
         """Add or update nodes in the graph."""
-        for node in nodes:
-            self.nodes[node.id] = node
+        # Walked more than once below, so a one-shot iterable is materialized first
+        nodes = list(nodes)
+        self.nodes.update((node.id, node) for node in nodes)
+        self._seen_nodes.update((node.id, node) for node in nodes)
+        self._index_nodes(nodes)
+        self._version += 1
 
     def add_edges(self, edges: List[Edge]) -> None:
         """Append edges to the graph."""
+        edges = list(edges)
         self.edges.extend(edges)
+        self._seen_edges.extend(edges)
+        self._index_edges(edges)
+        self._version += 1
 
     def add_constraints(self, constraints: List[Constraint]) -> None:
         """Append constraints to the graph."""
+        constraints = list(constraints)
         self.constraints.extend(constraints)
+        self._seen_constraints.extend(constraints)
+        self._version += 1
+
+    def _cached_render(self, key: str) -> Optional[Any]:
+        """Return the cached rendering for `key` if the graph hasn't changed since."""
+        self._resync()
+        entry = self._render_cache.get(key)
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        return None
 
     def summary(self) -> dict:
         """Return a lightweight JSON-serializable summary of the graph."""
@@ -59,47 +264,132 @@ class DiagramGraph(BaseModel):
             "num_constraints": len(self.constraints),
         }
 
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "DiagramGraph":
+        """
+        Rebuild a graph from `to_dict` output (e.g. the "graph" entry of a saved
+        run) without re-validating any of the models.
+        """
+        nodes = [Node.from_trusted_dict(n) for n in data.get("nodes", [])]
+        return cls.model_construct(
+            metadata=DiagramMetadata.model_construct(**data["metadata"]),
+            nodes={node.id: node for node in nodes},
+            edges=[Edge.from_trusted_dict(e) for e in data.get("edges", [])],
+            constraints=[Constraint.from_trusted_dict(c) for c in data.get("constraints", [])],
+        )
+
     def to_dict(self) -> dict:
         """Return a full JSON-serializable representation of the graph."""
         return {
             "metadata": self.metadata.model_dump(),
-            "nodes": [node.model_dump() for node in self.nodes.values()],
-            "edges": [edge.model_dump() for edge in self.edges],
-            "constraints": [constraint.model_dump() for constraint in self.constraints],
+            "nodes": [_shallow_dump(node) for node in self.nodes.values()],
+            "edges": [_shallow_dump(edge) for edge in self.edges],
+            "constraints": [_shallow_dump(c) for c in self.constraints],
         }
 
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """
+        Return the `to_dict` representation as a JSON string, serialized by
+        pydantic-core directly rather than via an intermediate dict.
+        """
+        # Contents are already validated, so skip validation on the wrapper
+        payload = _GraphPayload.model_construct(
+            metadata=self.metadata,
+            nodes=list(self.nodes.values()),
+            edges=self.edges,
+            constraints=self.constraints,
+        )
+        return payload.model_dump_json(indent=indent)
+
     def pretty_connections(self) -> str:
         """Render edges in a human-readable list with node labels and operators."""
+        cached = self._cached_render("connections")
+        if cached is not None:
+            return cached
         if not self.edges:
             return "Connections: (none)"
 
-        def label_for(node_id: str) -> str:
-            node = self.nodes.get(node_id)
-            if node:
-                return f"{node.label} [{node.id}]"
-            return f"{node_id} [missing]"
-
+        # Bind loop-invariant lookups to locals
+        labels = self._node_labels
+        polarity_fragments = _POLARITY_FRAGMENTS
         lines = ["Connections:"]
-        for edge in self.edges:
-            src = label_for(edge.source)
-            tgt = label_for(edge.target)
-            polarity = f", polarity={edge.attributes.polarity}" if edge.attributes.polarity else ""
-            lines.append(
-                f"- {src} --({edge.family}/{edge.operator}, directional={edge.attributes.directional}{polarity})--> {tgt}"
+        append = lines.append
+        for source, target, src_pos, tgt_pos, family, operator, directional, polarity in zip(
+            self._edge_source,
+            self._edge_target,
+            self._edge_source_pos,
+            self._edge_target_pos,
+            self._edge_family,
+            self._edge_operator,
+            self._edge_directional,
+            self._edge_polarity,
+        ):
+            src = labels[src_pos] if src_pos >= 0 else f"{source} [missing]"
+            tgt = labels[tgt_pos] if tgt_pos >= 0 else f"{target} [missing]"
+            fragment = polarity_fragments.get(polarity)
+            if fragment is None:
+                # Polarity set directly or via model_construct, outside the table
+                fragment = f", polarity={polarity}" if polarity else ""
+            append(
+                f"- {src} --({family}/{operator}, directional={directional}"
+                f"{fragment})--> {tgt}"
             )
-        return "\n".join(lines)
+        rendered = "\n".join(lines)
+        self._render_cache["connections"] = (self._version, rendered)
+        return rendered
 
     def pretty_constraints(self) -> str:
         """Render constraints in a concise, readable list."""
+        cached = self._cached_render("constraints")
+        if cached is not None:
+            return cached
         if not self.constraints:
             return "Constraints: (none)"
 
         lines = ["Constraints:"]
+        append = lines.append
         for c in self.constraints:
             scope = f" scope={c.scope}" if c.scope else ""
             hardness = "HARD" if c.hard else "SOFT"
-            lines.append(f"- [{c.family}][{hardness}] {c.id}: {c.description}{scope}")
-        return "\n".join(lines)
+            append(f"- [{c.family}][{hardness}] {c.id}: {c.description}{scope}")
+        rendered = "\n".join(lines)
+        self._render_cache["constraints"] = (self._version, rendered)
+        return rendered
+
+    def _dot_statements(self) -> Tuple[str, ...]:
+        """Node and edge statements of the DOT body, one tab-indented line each."""
+        cached = self._cached_render("dot")
+        if cached is not None:
+            return cached
+        quote = _dot_quote
+        colors = _TYPE_COLORS
+        operator_labels = _OPERATOR_LABELS
+        lines = []
+        append = lines.append
+        for node in self.nodes.values():
+            label = quote(node.label + "\\n(" + node.type + ")")
+            color = colors.get(node.type, "white")
+            append(f"\t{quote(node.id)} [label={label} fillcolor={color} shape=box style=filled]\n")
+        for source, target, operator, directional in zip(
+            self._edge_source,
+            self._edge_target,
+            self._edge_operator,
+            self._edge_directional,
+        ):
+            undirected = "" if directional else " dir=none"
+            append(
+                f"\t{quote(source)} -> {quote(target)} [label={quote(operator_labels[operator])}{undirected}]\n"
+            )
+        statements = tuple(lines)
+        self._render_cache["dot"] = (self._version, statements)
+        return statements
+
+    def to_dot_string(self) -> str:
+        """
+        Return the graph as Graphviz DOT source, built directly as text
+        without going through the graphviz package's object model.
+        """
+        return f"// {self.metadata.topic}\ndigraph {{\n{''.join(self._dot_statements())}}}\n"
 
     def to_graphviz(self):
         """
@@ -108,52 +398,28 @@ class DiagramGraph(BaseModel):
         Returns:
             graphviz.Digraph
         """
-        try:
-            from graphviz import Digraph
-        except ImportError as exc:
-            raise ImportError(
-                "graphviz is required for visualization. Install with `pip install graphviz`."
-            ) from exc
-
-        dot = Digraph(comment=self.metadata.topic)
-
-        # Color palette per node type
-        type_colors = {
-            "entity": "lightblue",
-            "process": "lightgreen",
-            "state": "khaki",
-            "variable": "plum",
-            "region": "lightgray",
-            "annotation": "white",
-        }
-
-        # Add nodes with colors by type
-        for node in self.nodes.values():
-            fillcolor = type_colors.get(node.type, "white")
-            dot.node(
-                node.id,
-                f"{node.label}\\n({node.type})",
-                style="filled",
-                fillcolor=fillcolor,
-                shape="box",
-            )
-
-        # Add edges; clean operator labels; omit polarity
-        for edge in self.edges:
-            attrs = {}
-            # Normalize operator name for readability
-            op_label = edge.operator.replace("_", " ")
-            if not edge.attributes.directional:
-                attrs["dir"] = "none"
-            dot.edge(edge.source, edge.target, label=op_label, **attrs)
-
+        dot = _get_digraph()(comment=self.metadata.topic)
+        # Nodes colored by type, edges labeled by operator; the statements are
+        # prebuilt as DOT text, one body entry each as node()/edge() would add
+        dot.body.extend(self._dot_statements())
         return dot
 
     def visualize_graph(self, output_path: Path | str = "graph.png") -> Path:
         """
         Render the graph to an image via graphviz. Returns the output path.
+
+        Pipes DOT text straight into the `dot` binary. Raises
+        GraphvizNotFoundError (an ImportError) if Graphviz's `dot` is not on PATH.
         """
-        dot = self.to_graphviz()
         output_path = Path(output_path)
-        rendered_path = dot.render(str(output_path), format=output_path.suffix.lstrip("."), cleanup=True)
-        return Path(rendered_path)
+        dot_binary = shutil.which("dot")
+        if dot_binary is None:
+            raise GraphvizNotFoundError(
+                "Graphviz `dot` executable not found on PATH; install Graphviz to render graphs."
+            )
+        subprocess.run(
+            [dot_binary, f"-T{output_path.suffix.lstrip('.')}", "-o", str(output_path)],
+            input=self.to_dot_string().encode("utf-8"),
+            check=True,
+        )
+        return output_path
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Literal, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Literal
 from .types import NodeType, AbstractionLevel, NodeRole, Importance
 
 class NodeAttributes(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
+
     abstraction_level: AbstractionLevel = Field(
         default="structural"
     )
@@ -21,7 +23,16 @@ class NodeAttributes(BaseModel):
 
 
 class Node(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True, defer_build=True)
+
     id: str
     type: NodeType
     label: str
     attributes: NodeAttributes
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Node":
+        """Build from already-validated data (e.g. model_dump() output) without re-validating."""
+        data = dict(data)
+        data["attributes"] = NodeAttributes.model_construct(**data["attributes"])
+        return cls.model_construct(**data)
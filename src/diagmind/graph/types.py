@@ -1,4 +1,5 @@
-from typing import Literal
+import sys
+from typing import Literal, Optional
 
 NodeType = Literal[
     "entity",
@@ -49,3 +50,8 @@ ConstraintFamily = Literal[
     "quantitative",
     "style"
 ]
+
+
+def intern_vocab(value: Optional[str]) -> Optional[str]:
+    """Intern a repeated free-form string (e.g. Edge.operator) so equal values share one object."""
+    return sys.intern(value) if value is not None else None
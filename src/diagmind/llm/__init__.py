@@ -1,3 +1,13 @@
-from .openai_client import parse
+from typing import Any
 
-__all__ = ["parse"]
+__all__ = ["parse", "aparse", "aparse_stream", "client_scope"]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing openai is the single most expensive import in the package, so
+    # defer it until a client function is actually requested (PEP 562).
+    if name in __all__:
+        from . import openai_client
+
+        return getattr(openai_client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
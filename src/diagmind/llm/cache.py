@@ -0,0 +1,133 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+# Set DIAGMIND_CACHE=1 to enable the on-disk response cache
+CACHE_ENV_VAR = "DIAGMIND_CACHE"
+CACHE_DIR = Path.home() / ".cache" / "diagmind"
+
+
+def cache_enabled() -> bool:
+    """Return True when the response cache is switched on via the environment."""
+    return os.getenv(CACHE_ENV_VAR) == "1"
+
+
+def cache_key(
+    system_prompt: str,
+    user_prompt: str,
+    response_format: Any,
+    model: str,
+    temperature: float,
+) -> str:
+    """Content-address a structured-output request."""
+    schema = json.dumps(response_format.model_json_schema(), sort_keys=True)
+    payload = "\x00".join(
+        [system_prompt, user_prompt, schema, model, repr(float(temperature))]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load(key: str, response_format: Any) -> Optional[Any]:
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        return response_format.model_validate_json(path.read_text())
+    except (OSError, ValueError):
+        # Missing, unreadable, or stale (schema no longer validates) entry
+        return None
+
+
+def _store(key: str, result: Any) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(result.model_dump_json())
+        # Atomic on POSIX and Windows, so concurrent runs never see a partial file
+        os.replace(tmp_path, CACHE_DIR / f"{key}.json")
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def cached(func: Callable) -> Callable:
+    """
+    Short-circuit a parse-style function with an on-disk response cache.
+
+    Works for sync functions, coroutines and async generators taking
+    `system_prompt`, `user_prompt`, `response_format`, `model` and
+    `temperature` arguments. Async generators must also take `item_field`
+    and yield the items of that list field; a hit replays the stored items.
+    Only active when DIAGMIND_CACHE=1.
+    """
+    signature = inspect.signature(func)
+
+    def key_for(args: tuple, kwargs: dict) -> Tuple[str, Any]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        key = cache_key(
+            arguments["system_prompt"],
+            arguments["user_prompt"],
+            arguments["response_format"],
+            arguments["model"],
+            arguments["temperature"],
+        )
+        return key, arguments["response_format"]
+
+    if inspect.isasyncgenfunction(func):
+
+        @functools.wraps(func)
+        async def stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not cache_enabled():
+                async for item in func(*args, **kwargs):
+                    yield item
+                return
+            key, response_format = key_for(args, kwargs)
+            item_field = signature.bind(*args, **kwargs).arguments["item_field"]
+            hit = _load(key, response_format)
+            if hit is not None:
+                for item in getattr(hit, item_field):
+                    yield item
+                return
+            items = []
+            async for item in func(*args, **kwargs):
+                items.append(item)
+                yield item
+            _store(key, response_format(**{item_field: items}))
+
+        return stream_wrapper
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not cache_enabled():
+                return await func(*args, **kwargs)
+            key, response_format = key_for(args, kwargs)
+            hit = _load(key, response_format)
+            if hit is not None:
+                return hit
+            result = await func(*args, **kwargs)
+            _store(key, result)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not cache_enabled():
+            return func(*args, **kwargs)
+        key, response_format = key_for(args, kwargs)
+        hit = _load(key, response_format)
+        if hit is not None:
+            return hit
+        result = func(*args, **kwargs)
+        _store(key, result)
+        return result
+
+    return wrapper
@@ -1,8 +1,106 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
 import os
-from typing import Any, Optional
-from openai import OpenAI
+import time
+import typing
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Optional
+from pydantic import BaseModel, TypeAdapter
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
+from .cache import cached
+
+logger = logging.getLogger(__name__)
+
+
+def _log_usage(model: str, completion: Any, elapsed: float) -> None:
+    """Log wall-clock time and token counts reported by the API."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    usage = completion.usage
+    if usage is None:
+        logger.debug("%s: %.2fs (no usage reported)", model, elapsed)
+        return
+    details = usage.prompt_tokens_details
+    cached_tokens = details.cached_tokens if details is not None else None
+    logger.debug(
+        "%s: %.2fs, prompt_tokens=%s (cached=%s), completion_tokens=%s",
+        model,
+        elapsed,
+        usage.prompt_tokens,
+        cached_tokens,
+        usage.completion_tokens,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _item_validator(response_format: Any, item_field: str) -> Callable[[Any], Any]:
+    """Return a validator for one item of a List[...] field, built once per field."""
+    (item_type,) = typing.get_args(response_format.model_fields[item_field].annotation)
+    if isinstance(item_type, type) and issubclass(item_type, BaseModel):
+        return item_type.model_validate
+    return TypeAdapter(item_type).validate_python
+
+
+@functools.lru_cache(maxsize=4)
+def _client(api_key: str) -> "OpenAI":
+    """Return a shared OpenAI client per API key, reusing its connection pool."""
+    # openai is imported on first use so importing this module (and cache
+    # hits) don't pay for it
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+# AsyncOpenAI clients opened inside the active `client_scope()`, per API key
+_scope_clients: contextvars.ContextVar[Optional[Dict[str, "AsyncOpenAI"]]] = contextvars.ContextVar(
+    "diagmind_async_clients", default=None
+)
+
+
+@contextlib.asynccontextmanager
+async def client_scope() -> AsyncIterator[None]:
+    """
+    Share one AsyncOpenAI client per API key across the `aparse` and
+    `aparse_stream` calls made inside the block, and close them on exit.
+
+    Clients are created on first use, so a block served entirely from the
+    response cache never opens one.
+    """
+    clients: Dict[str, "AsyncOpenAI"] = {}
+    token = _scope_clients.set(clients)
+    try:
+        yield
+    finally:
+        _scope_clients.reset(token)
+        for client in clients.values():
+            await client.close()
+
+
+@contextlib.asynccontextmanager
+async def _async_client(api_key: str) -> AsyncIterator["AsyncOpenAI"]:
+    """
+    Yield the active scope's client for `api_key`, or a client that is closed
+    again after this one call when no `client_scope()` is active.
+    """
+    from openai import AsyncOpenAI
+
+    clients = _scope_clients.get()
+    if clients is None:
+        async with AsyncOpenAI(api_key=api_key) as client:
+            yield client
+        return
+    client = clients.get(api_key)
+    if client is None:
+        client = clients[api_key] = AsyncOpenAI(api_key=api_key)
+    yield client
+
+
+@cached
 def parse(
     system_prompt: str,
     user_prompt: str,
@@ -22,6 +120,8 @@ def parse(
         temperature: Sampling temperature
         api_key: OpenAI API key (uses OPENAI_API_KEY env var if None)
     
+    Responses are served from the on-disk cache when DIAGMIND_CACHE=1.
+
     Returns:
         Parsed object matching the response_format
     """
@@ -30,8 +130,9 @@ def parse(
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable must be set")
     
-    client = OpenAI(api_key=api_key)
+    client = _client(api_key)
     
+    started = time.perf_counter()
     completion = client.chat.completions.parse(
         model=model,
         messages=[
@@ -41,9 +142,135 @@ def parse(
         temperature=temperature,
         response_format=response_format,
     )
+    _log_usage(model, completion, time.perf_counter() - started)
     
     parsed = completion.choices[0].message.parsed
     if parsed is None:
         raise ValueError("Failed to parse response from OpenAI API")
     
     return parsed
+
+
+@cached
+async def aparse(
+    system_prompt: str,
+    user_prompt: str,
+    response_format: Any,
+    model: str = "gpt-4o",
+    temperature: float = 1.0,
+    api_key: Optional[str] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Any:
+    """
+    Async variant of `parse` built on AsyncOpenAI, so independent calls can be
+    awaited concurrently (e.g. with asyncio.gather).
+
+    Args:
+        system_prompt: System message/instruction
+        user_prompt: User message/prompt
+        response_format: Pydantic model for structured output
+        model: Model name to use
+        temperature: Sampling temperature
+        api_key: OpenAI API key (uses OPENAI_API_KEY env var if None)
+        semaphore: Optional semaphore bounding the number of in-flight requests
+
+    Responses are served from the on-disk cache when DIAGMIND_CACHE=1.
+
+    Returns:
+        Parsed object matching the response_format
+    """
+    if api_key is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable must be set")
+
+    async with _async_client(api_key) as client, semaphore or contextlib.nullcontext():
+        started = time.perf_counter()
+        completion = await client.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            response_format=response_format,
+        )
+    _log_usage(model, completion, time.perf_counter() - started)
+
+    parsed = completion.choices[0].message.parsed
+    if parsed is None:
+        raise ValueError("Failed to parse response from OpenAI API")
+
+    return parsed
+
+
+@cached
+async def aparse_stream(
+    system_prompt: str,
+    user_prompt: str,
+    response_format: Any,
+    item_field: str,
+    model: str = "gpt-4o",
+    temperature: float = 1.0,
+    api_key: Optional[str] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncIterator[Any]:
+    """
+    Stream a structured response and yield the items of one of its list fields
+    as soon as each item is complete, instead of waiting for the whole payload.
+
+    Args:
+        system_prompt: System message/instruction
+        user_prompt: User message/prompt
+        response_format: Pydantic wrapper model for structured output
+        item_field: Name of the List[...] field on response_format to emit
+            (e.g. "nodes" for NodesResponse)
+        model: Model name to use
+        temperature: Sampling temperature
+        api_key: OpenAI API key (uses OPENAI_API_KEY env var if None)
+        semaphore: Optional semaphore bounding the number of in-flight
+            requests; held until the stream finishes
+
+    Responses are served from the on-disk cache when DIAGMIND_CACHE=1.
+
+    Yields:
+        Validated items of `item_field`, in response order
+    """
+    if api_key is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable must be set")
+
+    validate_item = _item_validator(response_format, item_field)
+
+    emitted = 0
+    async with _async_client(api_key) as client, semaphore or contextlib.nullcontext():
+        started = time.perf_counter()
+        async with client.chat.completions.stream(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            response_format=response_format,
+        ) as stream:
+            async for event in stream:
+                if event.type != "content.delta" or not isinstance(event.parsed, dict):
+                    continue
+                # The snapshot is parsed in partial mode, so the last list element
+                # may still be growing; every element before it is final.
+                items = event.parsed.get(item_field) or []
+                while emitted < len(items) - 1:
+                    yield validate_item(items[emitted])
+                    emitted += 1
+
+            completion = await stream.get_final_completion()
+    _log_usage(model, completion, time.perf_counter() - started)
+
+    parsed = completion.choices[0].message.parsed
+    if parsed is None:
+        raise ValueError("Failed to parse response from OpenAI API")
+
+    for item in getattr(parsed, item_field)[emitted:]:
+        yield item
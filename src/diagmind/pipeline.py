@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from . import llm
+from .graph import (
+    DiagramGraph,
+    DiagramMetadata,
+)
+from .utils import (
+    dumps,
+    dumps_bytes,
+    load_prompt,
+    DiagramIntent,
+    NodesResponse,
+    EdgesResponse,
+    ConstraintsResponse,
+)
+
+DEFAULT_MODEL = "gpt-4.1-2025-04-14"
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, in execution order; keys for per-stage model overrides
+STAGES = ("intent", "nodes", "edges", "constraints")
+
+
+async def run_pipeline_async(
+    inputs: Dict[str, str],
+    model: str = DEFAULT_MODEL,
+    temperature: float = 1.0,
+    stage_models: Optional[Dict[str, str]] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> DiagramGraph:
+    """
+    Build a diagram graph from a topic description.
+
+    Runs the LLM stages in order: diagram intent -> nodes -> edges -> constraints.
+
+    Args:
+        inputs: Mapping with "Scientific topic", "Audience", "Purpose" and
+            "Desired detail level" keys
+        model: Default model name for every stage
+        temperature: Sampling temperature
+        stage_models: Optional per-stage model overrides keyed by a name in
+            STAGES (e.g. {"constraints": "gpt-4o-mini"})
+        semaphore: Optional semaphore held around every LLM request, so
+            concurrent runs can share one cap on in-flight requests
+
+    Returns:
+        The populated DiagramGraph
+    """
+    stage_models = stage_models or {}
+    unknown = set(stage_models) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown pipeline stage(s): {sorted(unknown)}")
+
+    # One client per API key for the whole run, closed when the run ends
+    async with llm.client_scope():
+        # Format the user prompt with the input data
+        user_prompt = f"""Scientific topic: {inputs['Scientific topic']}
+Audience: {inputs['Audience']}
+Purpose: {inputs['Purpose']}
+Desired detail level: {inputs['Desired detail level']}"""
+
+        # Step 1: Infer diagram intent
+        logger.info("Step 1: Inferring diagram intent...")
+        diagram_intent_obj = await llm.aparse(
+            system_prompt=load_prompt("diagram_intent.txt"),
+            user_prompt=user_prompt,
+            response_format=DiagramIntent,
+            model=stage_models.get("intent", model),
+            temperature=temperature,
+            semaphore=semaphore,
+        )
+        diagram_intent = diagram_intent_obj.model_dump()
+        intent_json = dumps(diagram_intent)
+        logger.info("Parsed diagram intent:\n%s", intent_json)
+
+        # Inputs and intent are fixed from here on, so every later prompt shares
+        # this header verbatim
+        prompt_header = f"""{user_prompt}
+
+Inferred diagram intent:
+{intent_json}"""
+
+        # Initialize the graph with metadata
+        metadata = DiagramMetadata(
+            topic=inputs["Scientific topic"],
+            audience=inputs["Audience"],
+            purpose=inputs["Purpose"],
+            detail_level=inputs["Desired detail level"],
+            intent=diagram_intent,
+        )
+        graph = DiagramGraph(metadata=metadata)
+
+        # Step 2: Enumerate nodes using the diagram intent
+        logger.info("Step 2: Enumerating nodes...")
+        # Nodes are streamed into the graph as each one is decoded
+        nodes_result = NodesResponse(nodes=[])
+        async for node in llm.aparse_stream(
+            system_prompt=load_prompt("node_enumeration.txt"),
+            user_prompt=prompt_header,
+            response_format=NodesResponse,
+            item_field="nodes",
+            model=stage_models.get("nodes", model),
+            temperature=temperature,
+            semaphore=semaphore,
+        ):
+            nodes_result.nodes.append(node)
+            graph.add_nodes([node])
+            logger.debug("  node %s: %s (%s)", node.id, node.label, node.type)
+        logger.info("Total nodes enumerated: %d", len(nodes_result.nodes))
+
+        # Step 3: Construct edges using the enumerated nodes
+        logger.info("Step 3: Constructing edges...")
+        # Serialized once; the constraint prompt extends this one verbatim
+        edge_prompt = f"""{prompt_header}
+
+Enumerated nodes:
+{dumps([node.model_dump(mode="json") for node in nodes_result.nodes])}"""
+
+        edges_result = await llm.aparse(
+            system_prompt=load_prompt("edge_construction.txt"),
+            user_prompt=edge_prompt,
+            response_format=EdgesResponse,
+            model=stage_models.get("edges", model),
+            temperature=temperature,
+            semaphore=semaphore,
+        )
+        graph.add_edges(edges_result.edges)
+        logger.info("Total edges constructed: %d", len(edges_result.edges))
+
+        # Step 4: Generate constraints using nodes and edges
+        logger.info("Step 4: Generating constraints...")
+        constraint_prompt_text = f"""{edge_prompt}
+
+Constructed edges:
+{dumps([edge.model_dump(mode="json") for edge in edges_result.edges])}"""
+
+        constraints_result = await llm.aparse(
+            system_prompt=load_prompt("constraint.txt"),
+            user_prompt=constraint_prompt_text,
+            response_format=ConstraintsResponse,
+            model=stage_models.get("constraints", model),
+            temperature=temperature,
+            semaphore=semaphore,
+        )
+
+        graph.add_constraints(constraints_result.constraints)
+        logger.info("Total constraints generated: %d", len(constraints_result.constraints))
+
+        return graph
+
+
+def run_pipeline(
+    inputs: Dict[str, str],
+    model: str = DEFAULT_MODEL,
+    temperature: float = 1.0,
+    stage_models: Optional[Dict[str, str]] = None,
+) -> DiagramGraph:
+    """Synchronous wrapper around `run_pipeline_async`."""
+    return asyncio.run(
+        run_pipeline_async(
+            inputs,
+            model=model,
+            temperature=temperature,
+            stage_models=stage_models,
+        )
+    )
+
+
+def save_run(graph: DiagramGraph, inputs: Dict[str, str], base_path: Path) -> None:
+    """
+    Persist a pipeline run as `<base_path>.json` and, when graphviz is
+    installed, a rendered `<base_path>.png`.
+    """
+    # Save full graph payload as JSON
+    graph_payload = {
+        "inputs": inputs,
+        "diagram_intent": graph.metadata.intent,
+        "graph": graph.to_dict(),
+    }
+    json_path = base_path.with_suffix(".json")
+    json_path.write_bytes(dumps_bytes(graph_payload))
+    logger.info("Saved graph JSON -> %s", json_path)
+
+    # Save rendered graph as PNG (if graphviz is available)
+    png_path = base_path.with_suffix(".png")
+    try:
+        rendered_path = graph.visualize_graph(png_path)
+        logger.info("Saved graph PNG  -> %s", rendered_path)
+    except ImportError:
+        logger.warning(
+            "Graphviz not installed; skipped PNG render. "
+            "Install Graphviz and ensure the `dot` binary is on PATH."
+        )
@@ -1,4 +1,5 @@
 from .prompts import load_prompt
+from .serialization import dumps, dumps_bytes
 from .models import (
     DiagramIntent,
     NodesResponse,
@@ -9,6 +10,8 @@ from .models import (
 
 __all__ = [
     "load_prompt",
+    "dumps",
+    "dumps_bytes",
     "DiagramIntent",
     "NodesResponse",
     "EdgesResponse",
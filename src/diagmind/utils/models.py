@@ -1,7 +1,7 @@
-from typing import List, Optional, Dict
+from typing import List
 from pydantic import BaseModel
 
-from ..graph import Node, Edge, ConstraintFamily
+from ..graph import Node, Edge, Constraint
 
 
 # Diagram intent model for structured output
@@ -22,17 +22,12 @@ class EdgesResponse(BaseModel):
     edges: List[Edge]
 
 
-# Custom Constraint model for OpenAI structured output (fixes Dict[str, Any] issue)
-class ConstraintForOpenAI(BaseModel):
-    id: str
-    family: ConstraintFamily
-    description: str
-    scope: Optional[List[str]] = None
-    hard: bool = True
-    parameters: Optional[Dict[str, str]] = None  # More constrained type for OpenAI
+# The core Constraint already restricts parameters to Dict[str, str], so it is
+# used directly for structured output; this alias keeps the old import working.
+ConstraintForOpenAI = Constraint
 
 
 # Wrapper model for list of constraints (required for OpenAI structured output)
 class ConstraintsResponse(BaseModel):
-    constraints: List[ConstraintForOpenAI]
+    constraints: List[Constraint]
 
@@ -1,7 +1,20 @@
 from importlib import resources
 
+# Resolved once; prompts are fixed package data
+_PROMPTS_ROOT = resources.files("diagmind.prompts")
+
+# Every packaged prompt, read once at import
+_PROMPTS = {
+    entry.name: entry.read_text()
+    for entry in _PROMPTS_ROOT.iterdir()
+    if entry.is_file() and entry.name.endswith(".txt")
+}
 
-def load_prompt(name: str) -> str:
-    """Read a prompt file packaged under diagmind.prompts."""
-    return resources.files("diagmind.prompts").joinpath(name).read_text()
 
+def load_prompt(name: str) -> str:
+    """Return a prompt file packaged under diagmind.prompts (preloaded at import)."""
+    text = _PROMPTS.get(name)
+    if text is None:
+        # Not seen at import time (e.g. added to the package afterwards)
+        text = _PROMPTS_ROOT.joinpath(name).read_text()
+    return text
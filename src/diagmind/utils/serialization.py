@@ -0,0 +1,23 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    orjson = None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON with 2-space indentation (non-JSON types via str)."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Like `dumps_bytes`, but returns text for embedding in prompts or logs."""
+    return dumps_bytes(obj).decode("utf-8")